@@ -24,61 +24,123 @@ Evaluation pipeline columns (added 2026-04) — written in gate order after esti
 
 import argparse
 import json
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-import pandas as pd
 import re
-
-AZURE_EXPERIENCE_RE = re.compile(r'^https?://azure\.com/e/[^\s]+$', re.IGNORECASE)
-SHARED_ESTIMATE_RE = re.compile(
-    r'^https?://azure\.microsoft\.com/(?:[a-z]{2}-[a-z]{2}/)?pricing/calculator/?\?[^\s]*shared-estimate=[^\s]+$',
+import xlsxwriter
+
+try:
+    import orjson  # optional: parses the scan JSON straight from bytes, much faster
+except ImportError:
+    orjson = None
+
+# constant_memory streams each row to disk once the next one starts, so rows
+# must be written in order. URL auto-detection is off: the URL-heavy columns
+# should stay plain text.
+XLSX_WRITER_OPTIONS = {'constant_memory': True, 'strings_to_urls': False}
+
+# One alternation classifies a URL in a single regex call; the named group
+# that matched tells the link type. Used with fullmatch(), so no ^...$ anchors.
+ESTIMATE_LINK_RE = re.compile(
+    r'(?P<azure_experience>https?://azure\.com/e/[^\s]+)'
+    r'|(?P<shared_estimate>https?://azure\.microsoft\.com/(?:[a-z]{2}-[a-z]{2}/)?pricing/calculator/?\?[^\s]*shared-estimate=[^\s]+)',
     re.IGNORECASE,
 )
+# Cheap literal check (on the lowercased URL) that every match of the pattern
+# above must pass; most candidates are rejected without a regex.
+ESTIMATE_LINK_PREFIXES = (
+    'https://azure.com/e/', 'http://azure.com/e/',
+    'https://azure.microsoft.com/', 'http://azure.microsoft.com/',
+)
+# Scanner fields that may hold estimate links, in priority order.
+ESTIMATE_LINK_KEYS = (
+    'usable_estimate_links',
+    'azure_experience_links',
+    'shared_estimate_links',
+    'pricing_calculator_links',
+    'all_matching_links',
+    'calculator_other_links',
+    'calculator_shared_estimate_links',
+    'calculator_root_links',
+)
+
+# scan-results sheet columns, in output order.
+SCAN_RESULTS_COLUMNS = (
+    # ── Descriptive metadata ──────────────────────────────────────────────
+    'title_in_ac', 'description', 'azureCategories', 'ms.date', 'yml_url',
+    'image_download_urls', 'primary_image_path',
+    # ── Pricing estimate ──────────────────────────────────────────────────
+    'estimate_link',
+    # ── Evaluation pipeline (Gate 1 → 2 → 3) ─────────────────────────────
+    'scan_status', 'in_scope', 'out_of_scope_reason', 'criteria_passed', 'failure_reason',
+    # ── Source paths ──────────────────────────────────────────────────────
+    'yml_path', 'include_md_path',
+    # ── Authorship ────────────────────────────────────────────────────────
+    'md_author_name', 'md_ms_author_name',
+)
+# Plain text columns copied from a scanner field ('' when missing/empty), as
+# (scanner field, column) pairs.
+TEXT_FIELDS = (
+    ('title', 'title_in_ac'),
+    ('description', 'description'),
+    ('ms_date', 'ms.date'),
+    ('yml_url', 'yml_url'),
+    ('out_of_scope_reason', 'out_of_scope_reason'),
+    ('failure_reason', 'failure_reason'),
+    ('yml_path', 'yml_path'),
+    ('include_md_path', 'include_md_path'),
+    ('md_author_github', 'md_author_name'),
+    ('md_ms_author', 'md_ms_author_name'),
+)
 
 
 def collect_estimate_links(item: dict) -> list:
-    """Return ALL compliant estimate links (A/B), unique and deterministic order."""
-    candidates = []
-    for key in (
-        'usable_estimate_links',
-        'azure_experience_links',
-        'shared_estimate_links',
-        'pricing_calculator_links',
-        'all_matching_links',
-        'calculator_other_links',
-        'calculator_shared_estimate_links',
-        'calculator_root_links',
-    ):
-        vals = item.get(key) or []
-        if isinstance(vals, list):
-            candidates.extend([str(v).strip() for v in vals if v is not None])
-        elif vals:
-            candidates.append(str(vals).strip())
-
-    # de-dupe while preserving order
-    seen = set()
-    ordered = []
-    for u in candidates:
-        if not u or u in seen:
+    """Return ALL compliant estimate links (A/B), unique and deterministic order.
+
+    Expects an item normalized by normalize_item(), so every link field is a
+    list of non-empty, stripped strings.
+    """
+    candidates = tuple(chain.from_iterable(item[key] for key in ESTIMATE_LINK_KEYS))
+    return list(_classify_estimate_links(candidates))
+
+
+@lru_cache(maxsize=None)
+def _classify_estimate_links(candidates: tuple) -> tuple:
+    """Filter and order a candidate tuple; cached because many scenarios share
+    the same links (most often none at all).
+
+    Candidates are de-duped (first occurrence wins), then classified.
+    """
+    unique = dict.fromkeys(candidates)
+    azure_experience = []
+    shared_estimate = []
+    for u in unique:
+        if not u.lower().startswith(ESTIMATE_LINK_PREFIXES):
             continue
-        seen.add(u)
-        ordered.append(u)
-
-    out = []
-    out_seen = set()
-
-    def _add(regex):
-        for u in ordered:
-            if u in out_seen:
-                continue
-            if regex.match(u):
-                out_seen.add(u)
-                out.append(u)
+        m = ESTIMATE_LINK_RE.fullmatch(u)
+        if m is None:
+            continue
+        if m.lastgroup == 'azure_experience':
+            azure_experience.append(u)
+        else:
+            shared_estimate.append(u)
 
     # stable ordering by type
-    _add(AZURE_EXPERIENCE_RE)
-    _add(SHARED_ESTIMATE_RE)
+    return tuple(azure_experience + shared_estimate)
 
-    return out
+
+def normalize_item(item: dict) -> dict:
+    """Coerce the estimate link fields of a scanner item to lists of non-empty,
+    stripped strings (in place), so the per-row code needs no type guards.
+    """
+    for key in ESTIMATE_LINK_KEYS:
+        vals = item.get(key) or []
+        if not isinstance(vals, list):
+            vals = [vals]
+        stripped = [str(v).strip() for v in vals if v is not None]
+        item[key] = [u for u in stripped if u]
+    return item
 
 
 def join_list(v):
@@ -87,54 +149,71 @@ def join_list(v):
     return '' if v is None else str(v)
 
 
+def load_items(path) -> list:
+    """Return the normalized items list from a scanner scan-results.json file."""
+    if orjson is not None:
+        data = orjson.loads(Path(path).read_bytes())
+    else:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    return [normalize_item(it) for it in data.get('items', [])]
+
+
+def build_columns(items: list) -> dict:
+    """Return the scan-results sheet as {column: values}, in SCAN_RESULTS_COLUMNS order.
+
+    `items` must come from load_items() (or be passed through normalize_item()).
+
+    Also used by run_compare_only.py to rebuild the sheet in-process instead of
+    reading it back from scan-results.xlsx.
+    """
+    # Plain text columns are filled one column at a time with a comprehension,
+    # which is cheaper than ten indexed stores per row; only the derived columns
+    # below need the per-row loop. Lists are pre-sized so callers can build the
+    # DataFrame column-wise, without a dict per row.
+    n = len(items)
+    cols = {name: [None] * n for name in SCAN_RESULTS_COLUMNS}
+    for src, name in TEXT_FIELDS:
+        cols[name] = [it.get(src) or '' for it in items]
+    for i, it in enumerate(items):
+        links = collect_estimate_links(it)
+        # ── Descriptive metadata ──────────────────────────────────────────
+        cols['azureCategories'][i] = (
+            '; '.join(it.get('azureCategories') or [])
+            if isinstance(it.get('azureCategories'), list)
+            else (it.get('azureCategories') or '')
+        )
+        cols['image_download_urls'][i] = join_list(it.get('image_download_urls') or [])
+        # First image reference found in the article — useful for populating
+        # primary_image_path in estimate_scenarios.xlsx when processing new candidates
+        cols['primary_image_path'][i] = (it.get('image_paths') or [None])[0] or ''
+        # ── Pricing estimate ──────────────────────────────────────────────
+        cols['estimate_link'][i] = "\n".join(links)
+        # ── Evaluation pipeline (Gate 1 → 2 → 3) ─────────────────────────
+        cols['scan_status'][i] = it.get('scan_status') or 'ok'
+        cols['in_scope'][i] = bool(it.get('in_scope', False))
+        cols['criteria_passed'][i] = bool(it.get('criteria_passed', False))
+
+    return cols
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument('--input', default='scan-results.json')
     ap.add_argument('--output', default='scan-results.xlsx')
     args = ap.parse_args()
 
-    data = json.loads(Path(args.input).read_text(encoding='utf-8'))
-    items = data.get('items', [])
+    items = load_items(args.input)
+    cols = build_columns(items)
 
-    rows = []
-    for it in items:
-        links = collect_estimate_links(it)
-        rows.append({
-            # ── Descriptive metadata ──────────────────────────────────────
-            'title_in_ac': it.get('title') or '',
-            'description': it.get('description') or '',
-            'azureCategories': '; '.join(it.get('azureCategories') or [])
-            if isinstance(it.get('azureCategories'), list)
-            else (it.get('azureCategories') or ''),
-            'ms.date': it.get('ms_date') or '',
-            'yml_url': it.get('yml_url') or '',
-            'image_download_urls': join_list(it.get('image_download_urls') or []),
-            # First image reference found in the article — useful for populating
-            # primary_image_path in estimate_scenarios.xlsx when processing new candidates
-            'primary_image_path': (
-                (it.get('image_paths') or [None])[0] or ''
-            ),
-            # ── Pricing estimate ──────────────────────────────────────────
-            'estimate_link': "\n".join(links),
-            # ── Evaluation pipeline (Gate 1 → 2 → 3) ─────────────────────
-            'scan_status': it.get('scan_status') or 'ok',
-            'in_scope': bool(it.get('in_scope', False)),
-            'out_of_scope_reason': it.get('out_of_scope_reason') or '',
-            'criteria_passed': bool(it.get('criteria_passed', False)),
-            'failure_reason': it.get('failure_reason') or '',
-            # ── Source paths ──────────────────────────────────────────────
-            'yml_path': it.get('yml_path') or '',
-            'include_md_path': it.get('include_md_path') or '',
-            # ── Authorship ────────────────────────────────────────────────
-            'md_author_name': it.get('md_author_github') or '',
-            'md_ms_author_name': it.get('md_ms_author') or '',
-        })
-
-    df = pd.DataFrame(rows)
-    with pd.ExcelWriter(args.output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='scan-results', index=False)
-
-    print(f"Wrote {len(df)} rows to {args.output} (sheet: scan-results)")
+    # Rows go straight from the column lists to xlsxwriter; no DataFrame or
+    # to_excel() per-cell formatting in between.
+    with xlsxwriter.Workbook(args.output, XLSX_WRITER_OPTIONS) as workbook:
+        ws = workbook.add_worksheet('scan-results')
+        ws.write_row(0, 0, SCAN_RESULTS_COLUMNS)
+        for r, row in enumerate(zip(*cols.values()), start=1):
+            ws.write_row(r, 0, row)
+
+    print(f"Wrote {len(items)} rows to {args.output} (sheet: scan-results)")
 
 
 if __name__ == '__main__':
@@ -1,9 +1,18 @@
+import argparse
+import numpy as np
 import pandas as pd
+import xlsxwriter
 from pathlib import Path
 from datetime import datetime
 import os
+import sys
 from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
+# Shared with the sibling build step; put scripts/ on the path explicitly so the
+# import does not depend on how this script is invoked.
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from build_scan_results_xlsx import XLSX_WRITER_OPTIONS, build_columns, load_items
+
 SCAN_RESULTS_PATH = Path('scan-results.xlsx')
 ESTIMATE_SCENARIOS_PATH = Path('estimate_scenarios.xlsx')
 
@@ -21,6 +30,9 @@ STATUS_NEW_CANDIDATE = 'new_estimate_candidate'
 STATUS_NOT_APPLICABLE = 'not_applicable'
 STATUS_LINK_REMOVED = 'estimate_link_removed'
 
+# Text spellings accepted as TRUE in flag columns (after strip + lower)
+TRUE_STRINGS = ['true', '1', 'yes']
+
 # --- URL normalization helpers ---
 
 def _normalize_learn_url(url: str) -> str:
@@ -96,8 +108,50 @@ def _split_estimate_links(cell_value) -> list:
     return out
 
 
+def _write_sheet(workbook, sheet_name: str, df: pd.DataFrame) -> None:
+    """Stream a DataFrame into a new worksheet, one row at a time.
+
+    DataFrame.to_excel writes cells column by column, which loses data under
+    xlsxwriter's constant_memory mode; write_row keeps rows in order.
+    Missing values are written as empty cells, as to_excel does.
+    """
+    ws = workbook.add_worksheet(sheet_name)
+    ws.write_row(0, 0, [str(c) for c in df.columns])
+    values = df.astype(object).where(df.notna(), None)
+    for r, row in enumerate(values.itertuples(index=False, name=None), 1):
+        ws.write_row(r, 0, row)
+
+
+def _is_true(series: pd.Series) -> pd.Series:
+    """Boolean mask for a flag column holding booleans or TRUE-ish text.
+
+    Columns rebuilt from scan-results.json are already bool, so they skip the
+    three string passes needed for values read back from a workbook.
+    """
+    if series.dtype == bool:
+        return series
+    return (
+        series.astype(str).str.strip().str.lower().isin(TRUE_STRINGS)
+        | (series == True)
+    )
+
+
 # --- Load data ---
-scan_df = pd.read_excel(SCAN_RESULTS_PATH)
+ap = argparse.ArgumentParser()
+ap.add_argument('--scan-json', default=None,
+                help='Scanner JSON to rebuild the scan-results sheet from (the same way '
+                     'build_scan_results_xlsx.py does) instead of reading scan-results.xlsx')
+args = ap.parse_args()
+
+# scan-results.xlsx is rewritten in full below either way.
+if args.scan_json:
+    if not Path(args.scan_json).exists():
+        sys.exit(f'ERROR: {args.scan_json} not found.')
+    print(f"Loading scan results from {args.scan_json}")
+    scan_df = pd.DataFrame(build_columns(load_items(args.scan_json)))
+else:
+    print(f"Loading scan results from {SCAN_RESULTS_PATH}")
+    scan_df = pd.read_excel(SCAN_RESULTS_PATH)
 est_df = pd.read_excel(ESTIMATE_SCENARIOS_PATH)
 
 required_scan = {YML_URL_COL, ESTIMATE_LINK_COL, CRITERIA_COL}
@@ -116,7 +170,8 @@ if missing_inv:
         f"Found columns: {list(est_df.columns)}"
     )
 
-# Ensure comparison_status exists
+# Ensure comparison_status exists (it is fully recomputed below; this keeps
+# its column position stable)
 if STATUS_COL not in scan_df.columns:
     scan_df[STATUS_COL] = STATUS_NOT_APPLICABLE
 
@@ -133,19 +188,10 @@ if IN_SCOPE_COL not in scan_df.columns:
 # Only rows that pass both gates participate in comparison and the action queue tabs.
 scan_ok = scan_df[SCAN_STATUS_COL].astype(str).str.strip().str.lower() == 'ok'
 
-in_scope = scan_ok & (
-    scan_df[IN_SCOPE_COL].astype(str).str.strip().str.lower().isin(['true', '1', 'yes'])
-    | (scan_df[IN_SCOPE_COL] == True)
-)
-
-# Out-of-scope rows always get not_applicable — no further evaluation
-scan_df.loc[~in_scope, STATUS_COL] = STATUS_NOT_APPLICABLE
+in_scope = scan_ok & _is_true(scan_df[IN_SCOPE_COL])
 
 # --- criteria_passed gate (within in-scope rows only) ---
-criteria_true = (
-    scan_df[CRITERIA_COL].astype(str).str.strip().str.lower().isin(['true', '1', 'yes'])
-    | (scan_df[CRITERIA_COL] == True)
-)
+criteria_true = _is_true(scan_df[CRITERIA_COL])
 
 # Normalize scenario keys (Learn URL)
 scan_df['_scenario_key'] = scan_df[YML_URL_COL].astype(str).map(_normalize_learn_url)
@@ -155,69 +201,92 @@ est_df['_scenario_key'] = est_df[YML_URL_COL].astype(str).map(_normalize_learn_u
 # title_in_ac        — article title from the Architecture Center (scanner output)
 # title_in_calculator — title as it appears in the Pricing Calculator (from estimate_scenarios.xlsx)
 ac_title_map = dict(zip(scan_df['_scenario_key'], scan_df.get('title_in_ac', pd.Series(dtype=str)).fillna('')))
-calc_title_map = {}
-for _, row in est_df.iterrows():
-    key = row.get('_scenario_key', '')
-    if key:
-        calc_title_map[key] = str(row.get('title_in_calculator') or '').strip()
 
-# Build two lookup structures from the inventory:
+# Build the inventory lookup structures in a single pass over estimate_scenarios:
+#   calc_title_map — title_in_calculator for every inventory row (see above)
 #   inv_map      — Published rows only; used for estimate link comparison
 #   excluded_urls — non-Published rows (e.g. Skip); these are known to the
 #                  inventory but intentionally excluded from the calculator.
 #                  A scanned article whose URL appears here should never be
 #                  surfaced as a new_estimate_candidate.
 SKIP_STATUS = 'Skip'
+calc_title_map = {}
 inv_map = {}
 excluded_urls = set()
-for _, row in est_df.iterrows():
-    key = row.get('_scenario_key', '')
+for key, calc_title, row_status, est_link in zip(
+    est_df['_scenario_key'].tolist(),
+    est_df['title_in_calculator'].tolist() if 'title_in_calculator' in est_df else [None] * len(est_df),
+    est_df['status'].tolist() if 'status' in est_df else [None] * len(est_df),
+    est_df[ESTIMATE_LINK_COL].tolist(),
+):
     if not key:
         continue
-    row_status = str(row.get('status') or '').strip()
+    calc_title_map[key] = str(calc_title or '').strip()
+    row_status = str(row_status or '').strip()
     if row_status == SKIP_STATUS:
         excluded_urls.add(key)   # explicitly excluded — do not surface in any action queue
         continue
-    inv_link = _normalize_estimate_url(row.get(ESTIMATE_LINK_COL, ''))
+    inv_link = _normalize_estimate_url(est_link)
     if not inv_link:
         continue
     inv_map[key] = inv_link
 
-matched_in_inventory = scan_df['_scenario_key'].isin(inv_map.keys())
+# Published inventory estimate link for each scanned row (NaN when the
+# scenario is not a Published inventory row)
+inv_link_by_row = scan_df['_scenario_key'].map(inv_map)
+matched_in_inventory = inv_link_by_row.notna()
 excluded_from_inventory = scan_df['_scenario_key'].isin(excluded_urls)
 
-# Within in-scope rows: apply criteria_passed -> comparison_status logic
-in_scope_no_criteria = in_scope & ~criteria_true
-# A scanned article is a new candidate only if it has an estimate link AND
-# is not already in the inventory (Published) AND is not explicitly excluded
-# (Skip or other non-Published status in estimate_scenarios.xlsx)
-in_scope_criteria_new = (
-    in_scope & criteria_true & ~matched_in_inventory & ~excluded_from_inventory
-)
-
-scan_df.loc[in_scope_no_criteria, STATUS_COL] = STATUS_NOT_APPLICABLE
-scan_df.loc[in_scope & criteria_true & excluded_from_inventory, STATUS_COL] = STATUS_NOT_APPLICABLE
-scan_df.loc[in_scope_criteria_new, STATUS_COL] = STATUS_NEW_CANDIDATE
-
-# Split matched existing scenario into SAME vs NEW estimate link (in-scope only)
+# Split matched existing scenario into SAME vs NEW estimate link (in-scope only):
+# SAME when the inventory link is among the scanned estimate links.
 applicable = in_scope & criteria_true & matched_in_inventory
-
-for idx, row in scan_df.loc[applicable].iterrows():
-    inv_link = inv_map.get(row['_scenario_key'], '')
-    scanned_links = _split_estimate_links(row.get(ESTIMATE_LINK_COL, ''))
-    if inv_link and any(l == inv_link for l in scanned_links):
-        scan_df.at[idx, STATUS_COL] = STATUS_SAME
-    else:
-        scan_df.at[idx, STATUS_COL] = STATUS_NEW_ESTIMATE
-
-# Reverse check — detect estimate link removal.
-# For every Published inventory scenario that IS found in the scan (i.e. the
-# article still exists and is in scope) but has criteria_passed = FALSE, the
-# estimate link has been removed from the article. This is distinct from
-# scenario_removed (page gone) and matched_existing_scenario_new_estimate
-# (link changed). Flag it so the calculator team can retire the scenario.
-for idx, row in scan_df.loc[in_scope & matched_in_inventory & ~criteria_true].iterrows():
-    scan_df.at[idx, STATUS_COL] = STATUS_LINK_REMOVED
+# Built on the applicable rows and reindexed (rather than assigned through the
+# mask) so that no applicable rows at all is fine too.
+same_estimate = pd.Series(
+    [
+        inv_link in _split_estimate_links(links)
+        for inv_link, links in zip(
+            inv_link_by_row[applicable].tolist(),
+            scan_df.loc[applicable, ESTIMATE_LINK_COL].tolist(),
+        )
+    ],
+    index=scan_df.index[applicable],
+    dtype=bool,
+).reindex(scan_df.index, fill_value=False)
+
+# Assign comparison_status for every row in one vectorized pass. Conditions
+# are checked in order; the first that holds wins.
+#   - Out-of-scope rows always get not_applicable — no further evaluation.
+#   - Reverse check — detect estimate link removal. A Published inventory
+#     scenario that IS found in the scan (the article still exists and is in
+#     scope) but has criteria_passed = FALSE has had its estimate link removed
+#     from the article. This is distinct from scenario_removed (page gone) and
+#     matched_existing_scenario_new_estimate (link changed). Flag it so the
+#     calculator team can retire the scenario.
+#   - Other in-scope rows without a usable estimate link are not_applicable.
+#   - Matched inventory scenarios split into SAME vs NEW estimate link.
+#   - Rows explicitly excluded from the inventory (Skip) are not_applicable.
+#   - Anything left has an estimate link AND is not already in the inventory
+#     (Published) AND is not explicitly excluded: a new candidate.
+scan_df[STATUS_COL] = np.select(
+    [
+        (~in_scope).to_numpy(),
+        (~criteria_true & matched_in_inventory).to_numpy(),
+        (~criteria_true).to_numpy(),
+        (matched_in_inventory & same_estimate).to_numpy(),
+        matched_in_inventory.to_numpy(),
+        excluded_from_inventory.to_numpy(),
+    ],
+    [
+        STATUS_NOT_APPLICABLE,
+        STATUS_LINK_REMOVED,
+        STATUS_NOT_APPLICABLE,
+        STATUS_SAME,
+        STATUS_NEW_ESTIMATE,
+        STATUS_NOT_APPLICABLE,
+    ],
+    default=STATUS_NEW_CANDIDATE,
+)
 
 # Action queues — all restricted to in-scope rows only.
 # Kept separate because they map to different workflows:
@@ -317,9 +386,10 @@ summary = pd.DataFrame({
     ]
 })
 
-with pd.ExcelWriter(SCAN_RESULTS_PATH, engine='openpyxl', mode='w') as writer:
-    scan_df.drop(columns=['_scenario_key']).to_excel(writer, sheet_name='scan-results', index=False)
-    estimate_updates.drop(columns=['_scenario_key'], errors='ignore').to_excel(writer, sheet_name='estimate-updates', index=False)
-    link_removed.drop(columns=['_scenario_key'], errors='ignore').to_excel(writer, sheet_name='estimate-link-removed', index=False)
-    new_candidates.drop(columns=['_scenario_key'], errors='ignore').to_excel(writer, sheet_name='new-candidates', index=False)
-    summary.to_excel(writer, sheet_name='summary', index=False)
+# One fresh, streamed write of every sheet.
+with xlsxwriter.Workbook(str(SCAN_RESULTS_PATH), XLSX_WRITER_OPTIONS) as workbook:
+    _write_sheet(workbook, 'scan-results', scan_df.drop(columns=['_scenario_key']))
+    _write_sheet(workbook, 'estimate-updates', estimate_updates.drop(columns=['_scenario_key'], errors='ignore'))
+    _write_sheet(workbook, 'estimate-link-removed', link_removed.drop(columns=['_scenario_key'], errors='ignore'))
+    _write_sheet(workbook, 'new-candidates', new_candidates.drop(columns=['_scenario_key'], errors='ignore'))
+    _write_sheet(workbook, 'summary', summary)
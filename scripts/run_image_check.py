@@ -51,6 +51,8 @@ import pandas as pd
 SCAN_RESULTS_PATH = Path('scan-results.xlsx')
 ESTIMATE_SCENARIOS_PATH = Path('estimate_scenarios.xlsx')
 
+XLSX_WRITER_OPTIONS = {'strings_to_urls': False}
+
 # Column names
 STATUS_COL = 'status'
 YML_URL_COL = 'yml_url'
@@ -113,9 +115,12 @@ def main():
     if SCAN_RESULTS_PATH.exists():
         try:
             scan_df = pd.read_excel(SCAN_RESULTS_PATH)
-            for _, row in scan_df.iterrows():
-                url = str(row.get('yml_url') or '').strip().rstrip('/')
-                t = str(row.get('title_in_ac') or '').strip()
+            for url, t in zip(
+                scan_df['yml_url'].tolist() if 'yml_url' in scan_df else [None] * len(scan_df),
+                scan_df['title_in_ac'].tolist() if 'title_in_ac' in scan_df else [None] * len(scan_df),
+            ):
+                url = str(url or '').strip().rstrip('/')
+                t = str(t or '').strip()
                 if url:
                     ac_title_map[url] = t
         except Exception:
@@ -244,7 +249,8 @@ def main():
             insert_at = cols.index(IMAGE_PATH_COL) + 1
             cols.insert(insert_at, IMAGE_SHA_COL)
             est_df = est_df[cols]
-        est_df.to_excel(ESTIMATE_SCENARIOS_PATH, index=False)
+        est_df.to_excel(ESTIMATE_SCENARIOS_PATH, index=False, engine='xlsxwriter',
+                        engine_kwargs={'options': XLSX_WRITER_OPTIONS})
         if update_baseline_mode:
             print(f'\nBaseline updated: wrote {new_baseline_count} hash(es) to {ESTIMATE_SCENARIOS_PATH}.')
         else:
@@ -293,7 +299,8 @@ def main():
     })
     summary_df = pd.concat([summary_df, image_summary], ignore_index=True)
 
-    with pd.ExcelWriter(SCAN_RESULTS_PATH, engine='openpyxl', mode='w') as writer:
+    with pd.ExcelWriter(SCAN_RESULTS_PATH, engine='xlsxwriter',
+                        engine_kwargs={'options': XLSX_WRITER_OPTIONS}) as writer:
         for sheet_name, df in existing_sheets.items():
             if sheet_name == 'summary':
                 continue
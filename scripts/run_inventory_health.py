@@ -50,6 +50,8 @@ import pandas as pd
 SCAN_RESULTS_PATH = Path('scan-results.xlsx')
 ESTIMATE_SCENARIOS_PATH = Path('estimate_scenarios.xlsx')
 
+XLSX_WRITER_OPTIONS = {'strings_to_urls': False}
+
 STATUS_COL = 'status'
 SKIP_STATUS = 'Skip'
 YML_URL_COL = 'yml_url'
@@ -168,15 +170,20 @@ def main():
     # ── Build lookup sets from scan results ────────────────────────────────
     # Normalized URL → scan_status and in_scope for every scanned row
     scan_index: dict = {}
-    for _, row in scan_df.iterrows():
-        key = _normalize_url(str(row.get(YML_URL_COL) or ''))
+    for yml_url, scan_status, in_scope, title_in_ac in zip(
+        scan_df[YML_URL_COL].tolist(),  # required column, checked above
+        scan_df[SCAN_STATUS_COL].tolist() if SCAN_STATUS_COL in scan_df else [None] * len(scan_df),
+        scan_df[IN_SCOPE_COL].tolist() if IN_SCOPE_COL in scan_df else [None] * len(scan_df),
+        scan_df['title_in_ac'].tolist() if 'title_in_ac' in scan_df else [None] * len(scan_df),
+    ):
+        key = _normalize_url(str(yml_url or ''))
         if not key:
             continue
         scan_index[key] = {
-            'scan_status': str(row.get(SCAN_STATUS_COL) or 'ok').strip().lower(),
-            'in_scope': str(row.get(IN_SCOPE_COL) or 'false').strip().lower()
-                        in ('true', '1', 'yes') or row.get(IN_SCOPE_COL) is True,
-            'title_in_ac': str(row.get('title_in_ac') or '').strip(),
+            'scan_status': str(scan_status or 'ok').strip().lower(),
+            'in_scope': str(in_scope or 'false').strip().lower()
+                        in ('true', '1', 'yes') or in_scope is True,
+            'title_in_ac': str(title_in_ac or '').strip(),
         }
 
     # ── Process each inventory row ─────────────────────────────────────────
@@ -391,7 +398,8 @@ def main():
 
     summary_df = pd.concat([summary_df, health_summary_rows], ignore_index=True)
 
-    with pd.ExcelWriter(SCAN_RESULTS_PATH, engine='openpyxl', mode='w') as writer:
+    with pd.ExcelWriter(SCAN_RESULTS_PATH, engine='xlsxwriter',
+                        engine_kwargs={'options': XLSX_WRITER_OPTIONS}) as writer:
         # Preserve all existing sheets in order
         for sheet_name, df in existing_sheets.items():
             if sheet_name == 'summary':
@@ -54,6 +54,10 @@ import argparse
 import json
 import os
 import re
+from collections import Counter
+from datetime import date, time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -62,6 +66,16 @@ try:
 except Exception:
     yaml = None
 
+try:
+    import orjson  # optional: much faster JSON encoder, writes UTF-8 bytes directly
+except Exception:
+    orjson = None
+
+# Prefer the libyaml C loader; PyYAML builds without it fall back to the
+# pure-Python SafeLoader. Resolved once here, not per file.
+if yaml is not None:
+    YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 INCLUDE_RE = re.compile(r"\[!INCLUDE\s*\[\s*\]\s*\(\s*([^\)\s]+\.md)\s*\)\s*\]", re.IGNORECASE)
 
 # Link detection
@@ -82,14 +96,31 @@ DOCS_IMAGE_SOURCE_RE = re.compile(r"(?i)\bsource\s*=\s*(?:\"([^\"]+)\"|'([^']+)'
 HTML_IMG_SRC_RE = re.compile(r"(?i)<img[^>]+\bsrc\s*=\s*(?:\"([^\"]+)\"|'([^']+)'|([^\s>]+))")
 HTML_SOURCE_SRCSET_RE = re.compile(r"(?i)<source[^>]+\bsrcset\s*=\s*(?:\"([^\"]+)\"|'([^']+)'|([^\s>]+))")
 
-THUMB_EXCLUDE_RE = re.compile(r"(?i)(/browse/thumbs/|\bthumbs/|thumbnail|social_image|/icons/)")
+# Any run of leading './' segments, removed in one call.
+DOTSLASH_PREFIX_RE = re.compile(r"^(?:\./)+")
+
+THUMB_EXCLUDE_PATTERN = r"(/browse/thumbs/|\bthumbs/|thumbnail|social_image|/icons/)"
+THUMB_EXCLUDE_RE = re.compile(THUMB_EXCLUDE_PATTERN, re.IGNORECASE)
+# Case-sensitive twin for lowercased ASCII input; IGNORECASE blocks sre's
+# literal fast paths, so this one is quicker.
+THUMB_EXCLUDE_LOWER_RE = re.compile(THUMB_EXCLUDE_PATTERN)
 
 
 def load_yaml(path: Path) -> Optional[dict]:
     if yaml is None:
         return None
     try:
-        return yaml.safe_load(path.read_text(encoding='utf-8', errors='ignore'))
+        raw = path.read_bytes()
+    except Exception:
+        return None
+    try:
+        # libyaml decodes the bytes itself; no Python-level decode pass.
+        return yaml.load(raw, Loader=YamlLoader)
+    except Exception:
+        pass
+    try:
+        # Invalid UTF-8 (or any other failure): retry on the text with bad bytes dropped.
+        return yaml.load(raw.decode('utf-8', errors='ignore'), Loader=YamlLoader)
     except Exception:
         return None
 
@@ -108,9 +139,11 @@ def clean_ref(ref: str) -> str:
     ref = (ref or '').strip()
     if ref.startswith('<') and ref.endswith('>'):
         ref = ref[1:-1].strip()
-    if ref.strip():
-        ref = ref.strip().split()[0]
-    return ref.strip('"').strip("'").strip().strip('()<>[]')
+    # ref is stripped here, and after split() it holds no whitespace at all,
+    # so no further whitespace strips are needed.
+    if ref:
+        ref = ref.split()[0]
+    return ref.strip('"').strip("'").strip('()<>[]')
 
 
 def resolve_repo_rel(base_dir: Path, ref: str, repo_root: Path) -> Optional[str]:
@@ -120,14 +153,27 @@ def resolve_repo_rel(base_dir: Path, ref: str, repo_root: Path) -> Optional[str]
     if re.match(r"^[a-zA-Z]+://", ref):
         return None
     ref = strip_query_fragment(ref)
-    while ref.startswith('./'):
-        ref = ref[2:]
+    if ref.startswith('./'):
+        ref = DOTSLASH_PREFIX_RE.sub('', ref)
     ref = ref.lstrip('/')
-    p = (base_dir / ref).resolve()
-    try:
-        return p.relative_to(repo_root.resolve()).as_posix()
-    except Exception:
+    # Plain string path math: no Path objects and no realpath() syscalls.
+    # repo_root must already be absolute and resolved (scan() ensures this).
+    root = os.fspath(repo_root)
+    p = os.path.normpath(os.path.join(base_dir, ref))
+    if p == root:
+        return '.'
+    root_prefix = os.path.join(root, '')
+    if not p.startswith(root_prefix):
         return None
+    return p[len(root_prefix):].replace(os.sep, '/')
+
+
+def image_format(img_rel: str) -> str:
+    """Return the lowercased extension of a path's last component, without the dot."""
+    stem, _, ext = img_rel.rpartition('/')[2].rpartition('.')
+    # A name with only a leading dot (e.g. '.gitignore') has no extension, as
+    # with Path.suffix; that is intentional.
+    return ext.lower() if stem else ''
 
 
 def make_raw_url(repo_slug: str, branch: str, repo_rel_path: str) -> str:
@@ -139,17 +185,17 @@ def make_github_blob_url(repo_slug: str, branch: str, repo_rel_path: str) -> str
 
 
 def make_learn_url_from_docs_path(repo_rel_path: str) -> str:
-    p = repo_rel_path.replace('\\', '/')
-    if p.startswith('docs/'):
-        p = p[len('docs/'):]
+    p = repo_rel_path.replace('\\', '/').removeprefix('docs/')
+    lowered = p.lower()  # lowered once; suffix checks are case-insensitive
     for ext in ('.yml', '.yaml', '.md'):
-        if p.lower().endswith(ext):
+        if lowered.endswith(ext):
             p = p[:-len(ext)]
+            lowered = lowered[:-len(ext)]
             break
     # Files named index.yml / index.md are the default document for their
     # directory. The docs publishing platform drops the /index segment when
     # serving, so we strip it here to produce the canonical URL.
-    if p.lower().endswith('/index'):
+    if lowered.endswith('/index'):
         p = p[:-len('/index')]
     return f"https://learn.microsoft.com/en-us/azure/architecture/{p}"
 
@@ -164,7 +210,7 @@ def parse_md_front_matter(md_text: str) -> dict:
     if yaml is None:
         return {}
     try:
-        d = yaml.safe_load(fm_text)
+        d = yaml.load(fm_text, Loader=YamlLoader)
         return d if isinstance(d, dict) else {}
     except Exception:
         return {}
@@ -178,37 +224,52 @@ def add_candidate(out: List[str], raw: str):
     raw = clean_ref(raw)
     if not raw:
         return
-    if THUMB_EXCLUDE_RE.search(raw):
+    # For ASCII, lower() + case-sensitive search matches exactly what
+    # IGNORECASE does; other text keeps the Unicode-aware pattern.
+    if raw.isascii():
+        if THUMB_EXCLUDE_LOWER_RE.search(raw.lower()):
+            return
+    elif THUMB_EXCLUDE_RE.search(raw):
         return
     out.append(raw)
 
 
-def extract_image_refs(md_text: str) -> List[str]:
+def extract_image_refs(md_text: str, lowered: str) -> List[str]:
+    """`lowered` is md_text.lower(), shared with categorize_links()."""
     refs: List[str] = []
 
-    for raw in MD_INLINE_IMG_RE.findall(md_text):
-        add_candidate(refs, raw)
-
-    for line in DOCS_IMAGE_BLOCK_RE.findall(md_text):
-        m = DOCS_IMAGE_SOURCE_RE.search(line)
-        if not m:
-            continue
-        add_candidate(refs, m.group(1) or m.group(2) or m.group(3) or '')
-
-    for g1, g2, g3 in HTML_IMG_SRC_RE.findall(md_text):
-        add_candidate(refs, g1 or g2 or g3 or '')
-
-    for g1, g2, g3 in HTML_SOURCE_SRCSET_RE.findall(md_text):
-        raw = (g1 or g2 or g3 or '')
-        if raw:
-            raw = raw.split(',')[0].strip().split()[0]
-        add_candidate(refs, raw)
-
-    ref_map = extract_reference_map(md_text)
-    for key in MD_REF_IMG_USE_RE.findall(md_text):
-        target = ref_map.get(key.strip().lower())
-        if target:
-            add_candidate(refs, target)
+    # Each pattern needs a literal marker; skip the passes whose marker is absent.
+    has_md_img = '![' in md_text
+
+    if has_md_img:
+        for raw in MD_INLINE_IMG_RE.findall(md_text):
+            add_candidate(refs, raw)
+
+    if ':::image' in lowered:
+        for line in DOCS_IMAGE_BLOCK_RE.findall(md_text):
+            m = DOCS_IMAGE_SOURCE_RE.search(line)
+            if not m:
+                continue
+            add_candidate(refs, m.group(1) or m.group(2) or m.group(3) or '')
+
+    if '<img' in lowered:
+        for g1, g2, g3 in HTML_IMG_SRC_RE.findall(md_text):
+            add_candidate(refs, g1 or g2 or g3 or '')
+
+    if '<source' in lowered:
+        for g1, g2, g3 in HTML_SOURCE_SRCSET_RE.findall(md_text):
+            raw = (g1 or g2 or g3 or '')
+            if raw:
+                raw = raw.split(',')[0].strip().split()[0]
+            add_candidate(refs, raw)
+
+    ref_uses = MD_REF_IMG_USE_RE.findall(md_text) if has_md_img else []
+    if ref_uses:
+        ref_map = extract_reference_map(md_text)
+        for key in ref_uses:
+            target = ref_map.get(key.strip().lower())
+            if target:
+                add_candidate(refs, target)
 
     seen = set()
     out: List[str] = []
@@ -219,11 +280,15 @@ def extract_image_refs(md_text: str) -> List[str]:
     return out
 
 
-def categorize_links(md_text: str) -> dict:
-    azure_experience_links = sorted(set(AZURE_E_RE.findall(md_text)))
-    calc_any = sorted(set(CALC_ANY_RE.findall(md_text)))
+def categorize_links(md_text: str, lowered: str) -> dict:
+    """`lowered` is md_text.lower(), shared with extract_image_refs()."""
+    # Most articles hold neither link type; a substring check on the lowered
+    # text (the patterns are case-insensitive) is far cheaper than a findall.
+    azure_experience_links = sorted(set(AZURE_E_RE.findall(md_text))) if 'azure.com/e/' in lowered else []
+    calc_any = sorted(set(CALC_ANY_RE.findall(md_text))) if 'pricing/calculator' in lowered else []
 
-    shared_est = sorted({u for u in calc_any if SHARED_ESTIMATE_RE.search(u)})
+    # calc_any is sorted and unique, so filtering it keeps both properties.
+    shared_est = [u for u in calc_any if SHARED_ESTIMATE_RE.search(u)]
 
     calc_root: List[str] = []
     calc_other: List[str] = []
@@ -234,13 +299,15 @@ def categorize_links(md_text: str) -> dict:
         else:
             calc_other.append(u)
 
+    # Stripping can make two root links equal, so they still need a de-dupe.
     calc_root = sorted(set(calc_root))
-    calc_other = sorted(set(calc_other))
 
-    shared_estimate_links = sorted(set(azure_experience_links + shared_est))
-    all_matching_links = sorted(set(azure_experience_links + calc_any))
+    # azure.com/e/ and azure.microsoft.com links can never be equal, so these
+    # unions of unique lists need a sort but no de-dupe.
+    shared_estimate_links = sorted(azure_experience_links + shared_est)
+    all_matching_links = sorted(azure_experience_links + calc_any)
 
-    usable_estimate_links = sorted(set(azure_experience_links + shared_est))
+    usable_estimate_links = list(shared_estimate_links)
 
     return {
         'azure_experience_links': azure_experience_links,
@@ -344,58 +411,105 @@ def evaluate_scope(base: dict) -> None:
     base['out_of_scope_reason'] = '; '.join(reasons)
 
 
+# Repo-relative POSIX paths of the files under docs-root, from the directory
+# walk in scan(). Pool workers receive it through _init_scan_state().
+_REPO_FILES: set = set()
+
+# Pass 1 include md results, keyed by md path: (front matter,
+# _md_content_fields()). Reset by _init_scan_state() at the start of every scan
+# and in every pool worker, so it never outlives one scan (and repo slug and
+# branch, being fixed for a scan, need not be part of the key).
+_INCLUDE_MD_CACHE: Dict[str, tuple] = {}
+
+
+def _init_scan_state(repo_files: set) -> None:
+    global _REPO_FILES, _INCLUDE_MD_CACHE
+    _REPO_FILES = repo_files
+    _INCLUDE_MD_CACHE = {}
+
+
+def walk_docs(repo_root: Path, docs_path: Path) -> Tuple[List[str], List[str], set]:
+    """Walk docs_path once.
+
+    Returns (sorted *.yml/*.yaml paths, sorted *.md paths, repo-relative POSIX
+    path of every file). os.walk lists each file once, so no de-duplication is
+    needed.
+    """
+    yml_files: List[str] = []
+    md_files: List[str] = []
+    repo_files = set()
+    for dirpath, _dirnames, filenames in os.walk(os.path.normpath(docs_path)):
+        rel_dir = Path(os.path.relpath(dirpath, repo_root)).as_posix()
+        for name in filenames:
+            repo_files.add(f"{rel_dir}/{name}")
+            if name.endswith(('.yml', '.yaml')):
+                yml_files.append(os.path.join(dirpath, name))
+            elif name.endswith('.md'):
+                md_files.append(os.path.join(dirpath, name))
+    yml_files.sort()
+    md_files.sort()
+    return yml_files, md_files, repo_files
+
+
+def _md_content_fields(md_file: Path, md_text: str, repo_root: Path, repo_slug: str, branch: str) -> dict:
+    """Return the link and image fields for one md article.
+
+    Depends only on the article (and run-wide repo settings), so results can be
+    shared by every YML file that includes the same md.
+    """
+    lowered = md_text.lower()  # once, for the marker checks in both passes
+    fields = categorize_links(md_text, lowered)
+
+    img_refs = extract_image_refs(md_text, lowered)
+    image_paths: List[str] = []
+    image_download_urls: List[str] = []
+    image_exists: List[bool] = []
+    image_formats: List[str] = []
+    for raw in img_refs:
+        cleaned = clean_ref(raw)
+        img_rel = resolve_repo_rel(os.path.dirname(md_file), cleaned, repo_root)
+        if img_rel is None:
+            img_rel = strip_query_fragment(cleaned).lstrip('/')
+        image_paths.append(img_rel)
+        image_download_urls.append(make_raw_url(repo_slug, branch, img_rel))
+        # Set lookup first (one directory walk, see walk_docs); stat only on a miss.
+        exists = img_rel in _REPO_FILES or bool((repo_root / img_rel).exists())
+        image_exists.append(exists)
+        image_formats.append(image_format(img_rel))
+
+    fields['image_paths'] = image_paths
+    fields['image_download_urls'] = image_download_urls
+    fields['image_exists_in_repo'] = image_exists
+    fields['image_formats'] = image_formats
+    return fields
+
+
 def _scan_md_content(
     base: dict,
-    md_file: Path,
-    md_text: str,
-    repo_root: Path,
-    repo_slug: str,
-    branch: str,
+    fields: dict,
     counts: dict,
     failures: list,
     debug: bool,
     debug_key: str,
 ):
-    """Gate 3 — scan md content for links + images and set criteria_passed.
+    """Gate 3 — apply the md content fields (see _md_content_fields) and set criteria_passed.
 
     scan_status is set to 'ok' at the top; all earlier pipeline errors bypass
     this function entirely via _mark_scan_error. evaluate_scope() (Gate 2) is
     called at the end, after all content fields are populated.
     """
     base['scan_status'] = 'ok'  # Gate 1 passed — file resolved and content found
-    link_info = categorize_links(md_text)
-    for k, v in link_info.items():
+    for k, v in fields.items():
         if k in base:
-            base[k] = v
+            base[k] = list(v)  # fields may be cached and shared between records
 
-    has_any_calc = bool(link_info.get('pricing_calculator_links'))
-    has_usable = bool(link_info.get('usable_estimate_links'))
+    has_any_calc = bool(fields.get('pricing_calculator_links'))
+    has_usable = bool(fields.get('usable_estimate_links'))
     if has_any_calc:
         counts['md_has_any_calc_link'] += 1
     if has_usable:
         counts['md_has_usable_estimate_link'] += 1
 
-    img_refs = extract_image_refs(md_text)
-    image_paths: List[str] = []
-    image_download_urls: List[str] = []
-    image_exists: List[bool] = []
-    image_formats: List[str] = []
-    for raw in img_refs:
-        cleaned = clean_ref(raw)
-        img_rel = resolve_repo_rel(md_file.parent, cleaned, repo_root)
-        if img_rel is None:
-            img_rel = strip_query_fragment(cleaned).lstrip('/')
-        image_paths.append(img_rel)
-        image_download_urls.append(make_raw_url(repo_slug, branch, img_rel))
-        exists = bool((repo_root / img_rel).exists())
-        image_exists.append(exists)
-        image_formats.append(Path(img_rel).suffix.lower().lstrip('.'))
-
-    base['image_paths'] = image_paths
-    base['image_download_urls'] = image_download_urls
-    base['image_exists_in_repo'] = image_exists
-    base['image_formats'] = image_formats
-
     if has_usable:
         base['criteria_passed'] = True
         base['failure_reason'] = ''
@@ -420,12 +534,129 @@ def _scan_md_content(
         counts['out_of_scope'] += 1
 
 
-def scan(repo_root: Path, repo_slug: str, branch: str, docs_root: str, debug: bool):
+def _scan_yml_file(yml_path_str: str, repo_root: str, repo_slug: str, branch: str, debug: bool):
+    """Pass 1 worker — scan one YML file and the md article it includes.
+
+    Takes and returns only picklable values so it can run in a worker process.
+    Returns (record encoded by dumps_json(), counts delta, debug failures,
+    include md path (str) or None). Encoding here means a pool worker sends
+    back one bytes object instead of pickling the record dict.
+    """
+    yml_path = Path(yml_path_str)
+    repo_root = Path(repo_root)
+    counts = Counter()
+    failures = []
+    included_md = None
+
+    repo_rel_yml = os.path.relpath(yml_path_str, repo_root).replace(os.sep, '/')
+
+    base = _make_base_record(repo_slug, branch)
+    base['yml_url'] = make_learn_url_from_docs_path(repo_rel_yml)
+    base['yml_github_url'] = make_github_blob_url(repo_slug, branch, repo_rel_yml)
+    base['yml_path'] = repo_rel_yml
+
+    data = load_yaml(yml_path)
+    if not isinstance(data, dict):
+        _mark_scan_error(base, 'yaml_parse_failed', counts)
+        if debug:
+            failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status']})
+        return dumps_json(base), counts, failures, included_md
+
+    counts['yml_parsed'] += 1
+    title, description, azure_categories, y_author, y_ms_author, ms_date = extract_yaml_meta(data)
+    base['title'] = title
+    base['description'] = description
+    base['azureCategories'] = azure_categories
+    base['ms_date'] = ms_date
+
+    content = data.get('content')
+    if not isinstance(content, str):
+        _mark_scan_error(base, 'missing_content_string', counts)
+        if debug:
+            failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status']})
+        return dumps_json(base), counts, failures, included_md
+
+    inc = INCLUDE_RE.search(content)
+    if not inc:
+        _mark_scan_error(base, 'no_include_directive', counts)
+        if debug:
+            failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status']})
+        return dumps_json(base), counts, failures, included_md
+
+    counts['has_include'] += 1
+
+    include_md_ref = inc.group(1)
+    include_md_rel = resolve_repo_rel(yml_path.parent, include_md_ref, repo_root)
+    if not include_md_rel:
+        base['include_md_path'] = include_md_ref
+        _mark_scan_error(base, 'include_md_unresolvable', counts)
+        if debug:
+            failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status'], 'include_md_ref': include_md_ref})
+        return dumps_json(base), counts, failures, included_md
+
+    md_file = repo_root / include_md_rel
+    base['include_md_path'] = include_md_rel
+    base['include_md_github_url'] = make_github_blob_url(repo_slug, branch, include_md_rel)
+
+    # Register this md as consumed so the standalone pass skips it
+    included_md = str(md_file)
+
+    if not md_file.exists():
+        _mark_scan_error(base, 'include_md_missing', counts)
+        if debug:
+            failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status'], 'include_md_path': include_md_rel})
+        return dumps_json(base), counts, failures, included_md
+
+    counts['include_md_exists'] += 1
+
+    # Several YML files may include the same md; read and analyze it once.
+    cache_key = str(md_file)
+    cached = _INCLUDE_MD_CACHE.get(cache_key)
+    if cached is None:
+        md_text = md_file.read_text(encoding='utf-8', errors='ignore')
+        cached = (
+            parse_md_front_matter(md_text),
+            _md_content_fields(md_file, md_text, repo_root, repo_slug, branch),
+        )
+        _INCLUDE_MD_CACHE[cache_key] = cached
+    fm, fields = cached
+
+    base['md_author_github'] = (fm.get('author') if isinstance(fm, dict) else None) or y_author
+    base['md_ms_author'] = (fm.get('ms.author') if isinstance(fm, dict) else None) or y_ms_author
+
+    _scan_md_content(base, fields, counts, failures, debug, repo_rel_yml)
+    return dumps_json(base), counts, failures, included_md
+
+
+def _iter_scanned_yml_files(scan_one, yml_path_strs: List[str], repo_files: set, jobs: int):
+    """Yield scan_one(path) for each YML path, in order.
+
+    Each YML file is independent, so with jobs > 1 they are scanned in a
+    process pool; map() keeps the results in file order.
+    """
+    if jobs > 1 and len(yml_path_strs) > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_scan_state,
+                                 initargs=(repo_files,)) as ex:
+            yield from ex.map(scan_one, yml_path_strs,
+                              chunksize=max(1, len(yml_path_strs) // (jobs * 4)))
+    else:
+        yield from map(scan_one, yml_path_strs)
+
+
+def scan(repo_root: Path, repo_slug: str, branch: str, docs_root: str, debug: bool,
+         counts: dict, failures: list, jobs: Optional[int] = None):
+    """Yield one result record per scenario, encoded by dumps_json(), in output order.
+
+    Records are produced as they are scanned so the caller can write them out
+    without holding the whole result list. `counts` and `failures` are filled
+    in as the scan advances and are complete once the generator is exhausted.
+    `jobs` is the number of Pass 1 worker processes (default: CPU count).
+    """
+    repo_root = repo_root.resolve()  # once, so path helpers can use plain string math
     docs_path = repo_root / docs_root
-    yml_files = list(docs_path.rglob('*.yml')) + list(docs_path.rglob('*.yaml'))
-    yml_files = sorted({p.resolve(): p for p in yml_files}.values(), key=lambda p: str(p))
+    yml_files, md_files, repo_files = walk_docs(repo_root, docs_path)
 
-    counts = {
+    counts.update({
         'yml_total': len(yml_files),
         'yml_parsed': 0,
         'has_include': 0,
@@ -438,110 +669,44 @@ def scan(repo_root: Path, repo_slug: str, branch: str, docs_root: str, debug: bo
         'out_of_scope': 0,
         'passed': 0,
         'failed': 0,
-    }
-
-    failures = []
-    results = []
+    })
 
     # --- Pass 1: YML+MD pattern (existing behaviour) ---
     # Track every .md path that is consumed as an [!INCLUDE] target so we can
     # exclude them from the standalone-MD pass below.
-    included_md_paths: set = set()  # resolved absolute paths
-
-    for yml_path in yml_files:
-        repo_rel_yml = yml_path.relative_to(repo_root).as_posix()
-
-        base = _make_base_record(repo_slug, branch)
-        base['yml_url'] = make_learn_url_from_docs_path(repo_rel_yml)
-        base['yml_github_url'] = make_github_blob_url(repo_slug, branch, repo_rel_yml)
-        base['yml_path'] = repo_rel_yml
-
-        data = load_yaml(yml_path)
-        if not isinstance(data, dict):
-            _mark_scan_error(base, 'yaml_parse_failed', counts)
-            results.append(base)
-            if debug:
-                failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status']})
-            continue
-
-        counts['yml_parsed'] += 1
-        title, description, azure_categories, y_author, y_ms_author, ms_date = extract_yaml_meta(data)
-        base['title'] = title
-        base['description'] = description
-        base['azureCategories'] = azure_categories
-        base['ms_date'] = ms_date
-
-        content = data.get('content')
-        if not isinstance(content, str):
-            _mark_scan_error(base, 'missing_content_string', counts)
-            results.append(base)
-            if debug:
-                failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status']})
-            continue
-
-        inc = INCLUDE_RE.search(content)
-        if not inc:
-            _mark_scan_error(base, 'no_include_directive', counts)
-            results.append(base)
-            if debug:
-                failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status']})
-            continue
-
-        counts['has_include'] += 1
-
-        include_md_ref = inc.group(1)
-        include_md_rel = resolve_repo_rel(yml_path.parent, include_md_ref, repo_root)
-        if not include_md_rel:
-            base['include_md_path'] = include_md_ref
-            _mark_scan_error(base, 'include_md_unresolvable', counts)
-            results.append(base)
-            if debug:
-                failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status'], 'include_md_ref': include_md_ref})
-            continue
-
-        md_file = repo_root / include_md_rel
-        base['include_md_path'] = include_md_rel
-        base['include_md_github_url'] = make_github_blob_url(repo_slug, branch, include_md_rel)
-
-        # Register this md as consumed so the standalone pass skips it
-        included_md_paths.add(md_file.resolve())
-
-        if not md_file.exists():
-            _mark_scan_error(base, 'include_md_missing', counts)
-            results.append(base)
-            if debug:
-                failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status'], 'include_md_path': include_md_rel})
-            continue
-
-        counts['include_md_exists'] += 1
-
-        md_text = md_file.read_text(encoding='utf-8', errors='ignore')
-
-        fm = parse_md_front_matter(md_text)
-        base['md_author_github'] = (fm.get('author') if isinstance(fm, dict) else None) or y_author
-        base['md_ms_author'] = (fm.get('ms.author') if isinstance(fm, dict) else None) or y_ms_author
-
-        _scan_md_content(base, md_file, md_text, repo_root, repo_slug, branch,
-                         counts, failures, debug, repo_rel_yml)
-        results.append(base)
+    included_md_paths: set = set()  # absolute, normalized paths
+
+    scan_one = partial(_scan_yml_file, repo_root=str(repo_root), repo_slug=repo_slug,
+                       branch=branch, debug=debug)
+    _init_scan_state(repo_files)
+    jobs = jobs or os.cpu_count() or 1
+    scanned = _iter_scanned_yml_files(scan_one, yml_files, repo_files, jobs)
+    pass1_counts = Counter()
+    for record, counts_delta, file_failures, included_md in scanned:
+        pass1_counts.update(counts_delta)
+        failures.extend(file_failures)
+        if included_md is not None:
+            included_md_paths.add(included_md)
+        yield record
+    _INCLUDE_MD_CACHE.clear()
+    for k, v in pass1_counts.items():
+        counts[k] += v
 
     # --- Pass 2: Standalone MD pattern ---
     # These are .md files that publish as their own Architecture Center page,
     # identified by having a YAML front matter block with a 'title' field.
     # Files already consumed as [!INCLUDE] targets are excluded.
-    all_md_files = sorted(
-        {p.resolve(): p for p in docs_path.rglob('*.md')}.values(),
-        key=lambda p: str(p),
-    )
-    counts['standalone_md_total'] = sum(
-        1 for p in all_md_files if p.resolve() not in included_md_paths
-    )
-
-    for md_path in all_md_files:
-        if md_path.resolve() in included_md_paths:
-            continue  # already handled in Pass 1
-
-        md_text = md_path.read_text(encoding='utf-8', errors='ignore')
+    standalone_md_files = [p for p in md_files if p not in included_md_paths]
+    counts['standalone_md_total'] = len(standalone_md_files)
+
+    for md_path in standalone_md_files:
+        raw = Path(md_path).read_bytes()
+        # No front matter means no scenario (see below). When the first bytes
+        # are ASCII they decode to themselves, so this is decided without
+        # decoding the file.
+        if raw[:3] != b'---' and raw[:3].isascii():
+            continue
+        md_text = raw.decode('utf-8', errors='ignore')
         fm = parse_md_front_matter(md_text)
 
         # Only treat as a valid scenario page if front matter has a title.
@@ -550,7 +715,7 @@ def scan(repo_root: Path, repo_slug: str, branch: str, docs_root: str, debug: bo
             continue
 
         counts['standalone_md_scanned'] += 1
-        repo_rel_md = md_path.relative_to(repo_root).as_posix()
+        repo_rel_md = os.path.relpath(md_path, repo_root).replace(os.sep, '/')
 
         base = _make_base_record(repo_slug, branch)
         # For standalone MDs, yml_url is derived from the .md path itself.
@@ -569,11 +734,58 @@ def scan(repo_root: Path, repo_slug: str, branch: str, docs_root: str, debug: bo
         base['md_author_github'] = fm.get('author')
         base['md_ms_author'] = fm.get('ms.author')
 
-        _scan_md_content(base, md_path, md_text, repo_root, repo_slug, branch,
-                         counts, failures, debug, repo_rel_md)
-        results.append(base)
+        fields = _md_content_fields(md_path, md_text, repo_root, repo_slug, branch)
+        _scan_md_content(base, fields, counts, failures, debug, repo_rel_md)
+        yield dumps_json(base)
+
+
+def _json_default(obj):
+    # Unquoted YAML dates (e.g. ms.date: 2024-01-31) load as date/datetime;
+    # encode them as ISO strings, the same way orjson does.
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def dumps_json(obj) -> bytes:
+    """Return obj as 2-space indented UTF-8 JSON (orjson when installed, else stdlib json).
 
-    return results, counts, failures
+    Both paths produce the same output. orjson refuses some values stdlib json
+    accepts (integers beyond 64 bits); those records fall back to stdlib json.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+def write_json(path: Path, obj) -> None:
+    path.write_bytes(dumps_json(obj))
+
+
+def write_scan_results(path: Path, header: dict, items) -> int:
+    """Stream scan-results.json: header fields, then items one at a time, then count.
+
+    `items` yields records already encoded by dumps_json(). Produces the same
+    layout as dumping the whole document with indent=2. 'count' comes after
+    'items' because it is only known once the items are exhausted. Returns the
+    number of items.
+    """
+    count = 0
+    with path.open('wb') as f:
+        f.write(b'{\n')
+        for key, value in header.items():
+            f.write(b'  ' + dumps_json(key) + b': ' + dumps_json(value).replace(b'\n', b'\n  ') + b',\n')
+        f.write(b'  "items": [')
+        for item in items:
+            f.write(b',\n    ' if count else b'\n    ')
+            f.write(item.replace(b'\n', b'\n    '))
+            count += 1
+        f.write(b'\n  ],\n' if count else b'],\n')
+        f.write(b'  "count": ' + dumps_json(count) + b'\n}')
+    return count
 
 
 def main():
@@ -583,26 +795,29 @@ def main():
     ap.add_argument('--docs-root', default='docs')
     ap.add_argument('--output', default='scan-results.json')
     ap.add_argument('--debug', action='store_true', help='Write scan-debug.json with counts + sample failures')
+    ap.add_argument('--jobs', type=int, default=None,
+                    help='Worker processes for the YML pass (default: CPU count; 1 = serial)')
     args = ap.parse_args()
 
     repo_slug = args.repo or os.getenv('GITHUB_REPOSITORY') or 'MicrosoftDocs/architecture-center'
     repo_root = Path.cwd()
 
-    items, counts, failures = scan(repo_root, repo_slug, args.branch, args.docs_root, args.debug)
+    counts: dict = {}
+    failures: list = []
+    items = scan(repo_root, repo_slug, args.branch, args.docs_root, args.debug, counts, failures,
+                 jobs=args.jobs)
 
-    out = {
+    header = {
         'repo': repo_slug,
         'branch': args.branch,
         'docs_root': args.docs_root,
-        'count': len(items),
-        'items': items,
     }
 
-    Path(args.output).write_text(json.dumps(out, indent=2), encoding='utf-8')
+    written = write_scan_results(Path(args.output), header, items)
     print(
         f"Scanning docs_root={args.docs_root}: yml_total={counts['yml_total']}; "
         f"standalone_md_scanned={counts['standalone_md_scanned']}; "
-        f"wrote={len(items)}; in_scope={counts['in_scope']}; out_of_scope={counts['out_of_scope']}; "
+        f"wrote={written}; in_scope={counts['in_scope']}; out_of_scope={counts['out_of_scope']}; "
         f"passed={counts['passed']}; failed={counts['failed']}; "
         f"md_has_any_calc_link={counts['md_has_any_calc_link']}; md_has_usable_estimate_link={counts['md_has_usable_estimate_link']}"
     )
@@ -613,7 +828,7 @@ def main():
             'failures_total': len(failures),
             'failures_sample': failures[:1000],
         }
-        Path('scan-debug.json').write_text(json.dumps(dbg, indent=2), encoding='utf-8')
+        write_json(Path('scan-debug.json'), dbg)
         print(f"Wrote debug to scan-debug.json (failures_total={len(failures)})")
 
 